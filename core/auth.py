@@ -1,36 +1,173 @@
-from datetime import datetime, timedelta, timezone
-from jose import JWTError, jwt
+import asyncio
+import base64
+import binascii
+import hashlib
+import hmac
+import threading
+import time
+import bcrypt
+import orjson
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.security import APIKeyHeader
+from fastapi.security.utils import get_authorization_scheme_param
 from core.config import settings
 
-bearer_scheme = HTTPBearer()
+# A plain header read; unlike HTTPBearer it builds no credentials model per
+# request, and it still registers a security scheme for the /docs Authorize button.
+bearer_scheme = APIKeyHeader(name="Authorization", auto_error=False)
 
 ALGORITHM = "HS256"
 
+# base64url('{"alg":"HS256","typ":"JWT"}') — the header never changes, so it is
+# encoded once and compared byte-for-byte on decode.
+_HEADER_B64 = b"eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9"
+
+# Decoded payloads keyed by raw token. Entries carry their own expiry so a
+# token never outlives its `exp` claim; invalid tokens are remembered briefly.
+TOKEN_CACHE_TTL = 300
+INVALID_TOKEN_TTL = 1
+
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=TOKEN_CACHE_TTL)
+_token_cache_lock = threading.Lock()
+
+# Hot settings bound once at import rather than read per request. The keyed
+# HMAC is built once too; copying it skips re-deriving the padded key per call.
+_EXPIRE_SECONDS = settings.jwt_expire_minutes * 60
+_HMAC_TEMPLATE = hmac.new(settings.jwt_secret.encode(), digestmod=hashlib.sha256)
+
+
+class InvalidTokenError(ValueError):
+    pass
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def _sign(signing_input: bytes) -> bytes:
+    mac = _HMAC_TEMPLATE.copy()
+    mac.update(signing_input)
+    return mac.digest()
+
 
 def create_token(user_id: str, username: str) -> str:
-    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.jwt_expire_minutes)
     payload = {
         "sub": user_id,
         "username": username,
-        "exp": expire,
+        "exp": int(time.time()) + _EXPIRE_SECONDS,
     }
-    return jwt.encode(payload, settings.jwt_secret, algorithm=ALGORITHM)
+    signing_input = _HEADER_B64 + b"." + _b64encode(orjson.dumps(payload))
+    return (signing_input + b"." + _b64encode(_sign(signing_input))).decode()
+
+
+def _verify(token: str) -> dict:
+    """Verify an HS256 token issued by create_token and return its payload."""
+    try:
+        header, payload_b64, signature = token.encode("ascii").split(b".")
+    except (UnicodeEncodeError, ValueError):
+        raise InvalidTokenError("Malformed token")
+    if header != _HEADER_B64:
+        raise InvalidTokenError("Unsupported token header")
+
+    try:
+        expected = _sign(header + b"." + payload_b64)
+        if not hmac.compare_digest(_b64decode(signature), expected):
+            raise InvalidTokenError("Signature mismatch")
+        payload = orjson.loads(_b64decode(payload_b64))
+    except (binascii.Error, orjson.JSONDecodeError):
+        raise InvalidTokenError("Malformed token")
+
+    if not isinstance(payload, dict) or not isinstance(payload.get("exp"), (int, float)):
+        raise InvalidTokenError("Missing expiry")
+    if payload["exp"] <= time.time():
+        raise InvalidTokenError("Token expired")
+    return payload
+
+
+def _invalid_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired token",
+    )
 
 
 def decode_token(token: str) -> dict:
+    now = time.time()
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+    if cached is not None:
+        payload, expires_at = cached
+        if now < expires_at:
+            if payload is None:
+                raise _invalid_token()
+            return payload
+
     try:
-        return jwt.decode(token, settings.jwt_secret, algorithms=[ALGORITHM])
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-        )
+        payload = _verify(token)
+    except InvalidTokenError:
+        with _token_cache_lock:
+            _token_cache[token] = (None, now + INVALID_TOKEN_TTL)
+        raise _invalid_token()
+
+    expires_at = min(payload["exp"], now + TOKEN_CACHE_TTL)
+    with _token_cache_lock:
+        _token_cache[token] = (payload, expires_at)
+    return payload
+
+
+def purge_token_cache() -> None:
+    """Drop every cached token verification result."""
+    with _token_cache_lock:
+        _token_cache.clear()
+
+
+# New passwords are hashed with argon2id; bcrypt ("$2b$…") hashes from older
+# accounts still verify and are upgraded on the next successful login.
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
+
+# Each argon2 call allocates memory_cost (64 MiB). KDF work runs in worker
+# threads, but only this many at once, so a login burst can't pile up
+# ~2 GiB across the default thread pool — extra callers wait here instead.
+_password_slots = asyncio.Semaphore(settings.password_hash_concurrency)
+
+
+async def hash_password(password: str) -> str:
+    async with _password_slots:
+        return await asyncio.to_thread(_password_hasher.hash, password)
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-) -> dict:
+async def verify_password(password: str, password_hash: str) -> bool:
+    async with _password_slots:
+        return await asyncio.to_thread(_verify_password, password, password_hash)
+
+
+def _verify_password(password: str, password_hash: str) -> bool:
+    if password_hash.startswith("$2"):
+        return bcrypt.checkpw(password.encode(), password_hash.encode())
+    try:
+        return _password_hasher.verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(password_hash: str) -> bool:
+    return password_hash.startswith("$2") or _password_hasher.check_needs_rehash(password_hash)
+
+
+async def get_current_user(authorization: str | None = Depends(bearer_scheme)) -> dict:
     """FastAPI dependency — injects the current user payload into route handlers."""
-    return decode_token(credentials.credentials)
+    # The auth scheme is case-insensitive (RFC 7235) — TokenResponse itself says "bearer"
+    scheme, token = get_authorization_scheme_param(authorization)
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+        )
+    return decode_token(token)
@@ -1,3 +1,5 @@
+from functools import lru_cache
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -6,9 +8,18 @@ class Settings(BaseSettings):
     jwt_secret: str = "change-me"
     jwt_expire_minutes: int = 10080  # 7 days
     google_api_key: str = ""
+    password_hash_concurrency: int = Field(default=4, ge=1)  # concurrent 64 MiB argon2 hashes/verifies
+    gemini_concurrency: int = Field(default=8, ge=1)  # max in-flight Gemini requests per process
+    conversation_cache_ttl: int = 0  # seconds; opt-in reuse of generated conversations (0 = off)
 
     class Config:
         env_file = ".env"
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build Settings once; `.env` is only read on the first call."""
+    return Settings()
+
+
+settings = get_settings()
@@ -1,4 +1,6 @@
+from functools import lru_cache
 from pymongo import AsyncMongoClient
+from pymongo.errors import OperationFailure
 from core.config import settings
 
 _client: AsyncMongoClient | None = None
@@ -6,30 +8,37 @@ _client: AsyncMongoClient | None = None
 def get_client() -> AsyncMongoClient:
     global _client
     if _client is None:
-        _client = AsyncMongoClient(settings.mongodb_uri)
+        # tz_aware: read datetimes back as UTC-aware, matching what we insert
+        _client = AsyncMongoClient(settings.mongodb_uri, tz_aware=True)
     return _client
 
 
+@lru_cache(maxsize=1)
 def get_db():
     return get_client()["lingotogether"]
 
 
-# Shorthand collection accessors
+# Shorthand collection accessors — handles are resolved once and reused
+@lru_cache(maxsize=1)
 def users_col():
     return get_db()["users"]
 
 
+@lru_cache(maxsize=1)
 def rooms_col():
     return get_db()["rooms"]
 
 
+@lru_cache(maxsize=1)
 def conversations_col():
     return get_db()["conversations"]
 
 
+@lru_cache(maxsize=1)
 def languages_col():
     return get_db()["languages"]
 
+@lru_cache(maxsize=1)
 def levels_col():
     return get_db()["levels"]
 
@@ -39,6 +48,15 @@ async def create_indexes():
     await users_col().create_index("username", unique=True)
     await rooms_col().create_index("join_code", unique=True)
     await rooms_col().create_index("members.user_id")
-    await conversations_col().create_index("room_id")
+    # Compound index serves room_id lookups and the newest-first listing sort;
+    # it supersedes the old single-field room_id index
+    await conversations_col().create_index([("room_id", 1), ("created_at", -1)])
+    try:
+        await conversations_col().drop_index("room_id_1")
+    except OperationFailure as e:
+        # IndexNotFound — already dropped (possibly by another worker starting up)
+        if e.code != 27:
+            raise
     await languages_col().create_index("code", unique=True)
+    await languages_col().create_index("display_name", unique=True)
     await levels_col().create_index("code", unique=True)
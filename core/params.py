@@ -0,0 +1,42 @@
+from typing import Annotated
+from bson import ObjectId
+from fastapi import Depends, HTTPException
+from core.database import rooms_col
+
+
+# Path IDs are parsed once per request and handed to handlers as ObjectIds.
+
+def _parse_room_oid(room_id: str) -> ObjectId:
+    try:
+        return ObjectId(room_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid room ID")
+
+
+def _parse_conv_oid(conv_id: str) -> ObjectId:
+    try:
+        return ObjectId(conv_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid conversation ID")
+
+
+RoomOid = Annotated[ObjectId, Depends(_parse_room_oid)]
+ConversationOid = Annotated[ObjectId, Depends(_parse_conv_oid)]
+
+
+async def get_member_room_or_404(
+    room_oid: ObjectId,
+    user_id: str,
+    projection: dict | None = None,
+) -> dict:
+    """
+    Fetch a room the user belongs to, letting Mongo apply the membership filter.
+    The extra existence check only runs on the failure path, to tell 404 from 403.
+    """
+    doc = await rooms_col().find_one({"_id": room_oid, "members.user_id": user_id}, projection)
+    if doc:
+        return doc
+    # Membership filter missed — only now check whether the room exists at all
+    if await rooms_col().count_documents({"_id": room_oid}, limit=1):
+        raise HTTPException(status_code=403, detail="You are not a member of this room")
+    raise HTTPException(status_code=404, detail="Room not found")
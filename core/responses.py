@@ -0,0 +1,22 @@
+from typing import AsyncIterable, AsyncIterator
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+
+async def _json_array_chunks(items: AsyncIterable[BaseModel]) -> AsyncIterator[bytes]:
+    yield b"["
+    first = True
+    async for item in items:
+        if not first:
+            yield b","
+        yield item.model_dump_json().encode()
+        first = False
+    yield b"]"
+
+
+def stream_json_array(items: AsyncIterable[BaseModel]) -> StreamingResponse:
+    """
+    Stream models as a JSON array while they are still being produced — e.g.
+    straight off a Mongo cursor — so only one document is held at a time.
+    """
+    return StreamingResponse(_json_array_chunks(items), media_type="application/json")
@@ -1,6 +1,7 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from core.database import create_indexes
 from routers import auth, rooms, conversations, meta
@@ -19,6 +20,7 @@ app = FastAPI(
     description="AI-powered multiplayer language learning backend",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS — update origins for your frontend domain in production
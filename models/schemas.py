@@ -11,7 +11,9 @@ from bson import ObjectId
 # ─────────────────────────────────────────
 
 def utcnow() -> datetime:
-    return datetime.now(timezone.utc)
+    # BSON dates hold milliseconds — truncate so freshly built docs match stored ones
+    now = datetime.now(timezone.utc)
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
 
 
 def new_object_id() -> str:
@@ -186,7 +188,7 @@ class SubmitResponseRequest(BaseModel):
     input_mode: InputMode = InputMode.roman
 
 
-class ConversationResponse(BaseModel):
+class ConversationSummaryResponse(BaseModel):
     id: str
     room_id: str
     prompt: str
@@ -194,4 +196,7 @@ class ConversationResponse(BaseModel):
     current_turn: int
     created_at: datetime
     participants: list[Participant]
+
+
+class ConversationResponse(ConversationSummaryResponse):
     messages: list[Message]
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, HTTPException, status
-import bcrypt
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 
 from core.database import users_col
-from core.auth import create_token
+from core.auth import create_token, hash_password, password_needs_rehash, verify_password
 from models.schemas import RegisterRequest, LoginRequest, TokenResponse, User, utcnow
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
@@ -11,12 +11,7 @@ router = APIRouter(prefix="/auth", tags=["Auth"])
 
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
 async def register(body: RegisterRequest):
-    # Check username is not taken
-    existing = await users_col().find_one({"username": body.username.lower()})
-    if existing:
-        raise HTTPException(status_code=409, detail="Username already taken")
-
-    pw_hash = bcrypt.hashpw(body.password.encode(), bcrypt.gensalt()).decode()
+    pw_hash = await hash_password(body.password)
     user = User(
         username=body.username.lower(),
         password_hash=pw_hash,
@@ -25,7 +20,11 @@ async def register(body: RegisterRequest):
 
     doc = user.model_dump()
     doc["_id"] = ObjectId(user.id)
-    await users_col().insert_one(doc)
+    # The unique index on username rejects taken names atomically
+    try:
+        await users_col().insert_one(doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Username already taken")
 
     token = create_token(user.id, user.username)
     return TokenResponse(access_token=token, username=user.username)
@@ -37,8 +36,15 @@ async def login(body: LoginRequest):
     if not user:
         raise HTTPException(status_code=401, detail="Invalid username or password")
 
-    if not bcrypt.checkpw(body.password.encode(), user["password_hash"].encode()):
+    if not await verify_password(body.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid username or password")
 
+    # Upgrade legacy bcrypt (or outdated argon2) hashes now that we have the password
+    if password_needs_rehash(user["password_hash"]):
+        await users_col().update_one(
+            {"_id": user["_id"]},
+            {"$set": {"password_hash": await hash_password(body.password)}},
+        )
+
     token = create_token(str(user["_id"]), user["username"])
     return TokenResponse(access_token=token, username=user["username"])
@@ -1,11 +1,16 @@
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status
 from bson import ObjectId
+from pymongo import ReturnDocument
 
 from core.auth import get_current_user
 from core.database import rooms_col, conversations_col
+from core.params import ConversationOid, RoomOid, get_member_room_or_404
+from core.responses import stream_json_array
 from models.schemas import (
     CreateConversationRequest, InputMode, SubmitResponseRequest, ConversationResponse,
-    Conversation, Participant, Response, RoomStatus, ConversationStatus,
+    ConversationSummaryResponse,
+    Conversation, Message, Participant, Response, RoomStatus, ConversationStatus,
     Role, utcnow,
 )
 from services.ai import generate_conversation
@@ -18,56 +23,53 @@ ROLES = [Role.a, Role.b, Role.c, Role.d]
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
-async def _get_room_or_404(room_id: str) -> dict:
-    try:
-        oid = ObjectId(room_id)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid room ID")
-    doc = await rooms_col().find_one({"_id": oid})
-    if not doc:
-        raise HTTPException(status_code=404, detail="Room not found")
-    return doc
-
-
-async def _get_conversation_or_404(conv_id: str) -> dict:
-    try:
-        oid = ObjectId(conv_id)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid conversation ID")
-    doc = await conversations_col().find_one({"_id": oid})
+async def _get_conversation_or_404(conv_oid: ObjectId) -> dict:
+    doc = await conversations_col().find_one({"_id": conv_oid})
     if not doc:
         raise HTTPException(status_code=404, detail="Conversation not found")
     return doc
 
 
-def _assert_member(room_doc: dict, user_id: str) -> dict:
-    member = next((m for m in room_doc.get("members", []) if m["user_id"] == user_id), None)
-    if not member:
-        raise HTTPException(status_code=403, detail="You are not a member of this room")
-    return member
-
+# Stored documents were validated on insert, so responses are assembled with
+# model_construct. Enum fields are restored explicitly to keep serialization exact.
 
 def _conv_to_response(doc: dict) -> ConversationResponse:
-    return ConversationResponse(
+    return ConversationResponse.model_construct(
         id=str(doc["_id"]),
         room_id=doc["room_id"],
         prompt=doc["prompt"],
-        status=doc["status"],
+        status=ConversationStatus(doc["status"]),
         current_turn=doc["current_turn"],
         created_at=doc["created_at"],
-        participants=[Participant(**p) for p in doc.get("participants", [])],
+        participants=[_participant_from_doc(p) for p in doc.get("participants", [])],
         messages=[_msg_from_doc(m) for m in doc.get("messages", [])],
     )
 
 
-def _msg_from_doc(m: dict):
-    from models.schemas import Message, Response as Resp
+def _conv_to_summary(doc: dict) -> ConversationSummaryResponse:
+    return ConversationSummaryResponse.model_construct(
+        id=str(doc["_id"]),
+        room_id=doc["room_id"],
+        prompt=doc["prompt"],
+        status=ConversationStatus(doc["status"]),
+        current_turn=doc["current_turn"],
+        created_at=doc["created_at"],
+        participants=[_participant_from_doc(p) for p in doc.get("participants", [])],
+    )
+
+
+def _participant_from_doc(p: dict) -> Participant:
+    return Participant.model_construct(**{**p, "role": Role(p["role"])})
+
+
+def _msg_from_doc(m: dict) -> Message:
     resp = None
     if m.get("response"):
-        resp = Resp(**m["response"])
-    return Message(
+        r = m["response"]
+        resp = Response.model_construct(**{**r, "input_mode": InputMode(r.get("input_mode", InputMode.roman))})
+    return Message.model_construct(
         turn_number=m["turn_number"],
-        speaker=m["speaker"],
+        speaker=Role(m["speaker"]),
         roman_text=m["roman_text"],
         native_text=m["native_text"],
         english_text=m["english_text"],
@@ -81,6 +83,7 @@ def _msg_from_doc(m: dict):
 @router.post("", response_model=ConversationResponse, status_code=status.HTTP_201_CREATED)
 async def create_conversation(
     room_id: str,
+    room_oid: RoomOid,
     body: CreateConversationRequest,
     current_user: dict = Depends(get_current_user),
 ):
@@ -90,8 +93,7 @@ async def create_conversation(
     Calls Gemini to generate all 20 messages.
     """
     user_id = current_user["sub"]
-    room_doc = await _get_room_or_404(room_id)
-    _assert_member(room_doc, user_id)
+    room_doc = await get_member_room_or_404(room_oid, user_id)
 
     if room_doc["created_by"] != user_id:
         raise HTTPException(status_code=403, detail="Only the room creator can start a conversation")
@@ -149,7 +151,7 @@ async def create_conversation(
 
     # Mark room as active
     await rooms_col().update_one(
-        {"_id": ObjectId(room_id)},
+        {"_id": room_oid},
         {"$set": {
             "status": RoomStatus.active,
             "last_scenario": scenario,
@@ -158,36 +160,37 @@ async def create_conversation(
         }},
     )
 
-    saved = await conversations_col().find_one({"_id": doc["_id"]})
-    return _conv_to_response(saved)
+    return _conv_to_response(doc)
 
 
-@router.get("", response_model=list[ConversationResponse])
+@router.get("", response_model=list[ConversationSummaryResponse])
 async def list_conversations(
     room_id: str,
+    room_oid: RoomOid,
     current_user: dict = Depends(get_current_user),
 ):
-    """List all conversations in a room, newest first."""
-    room_doc = await _get_room_or_404(room_id)
-    _assert_member(room_doc, current_user["sub"])
+    """List all conversations in a room, newest first, without their messages."""
+    # Only membership matters here — skip shipping the room document
+    await get_member_room_or_404(room_oid, current_user["sub"], {"_id": 1})
 
     cursor = conversations_col().find(
         {"room_id": room_id},
+        {"messages": 0},
         sort=[("created_at", -1)],
     )
-    return [_conv_to_response(doc) async for doc in cursor]
+    return stream_json_array(_conv_to_summary(doc) async for doc in cursor)
 
 
 @router.get("/{conv_id}", response_model=ConversationResponse)
 async def get_conversation(
     room_id: str,
-    conv_id: str,
+    room_oid: RoomOid,
+    conv_oid: ConversationOid,
     current_user: dict = Depends(get_current_user),
 ):
-    room_doc = await _get_room_or_404(room_id)
-    _assert_member(room_doc, current_user["sub"])
+    await get_member_room_or_404(room_oid, current_user["sub"], {"_id": 1})
 
-    conv_doc = await _get_conversation_or_404(conv_id)
+    conv_doc = await _get_conversation_or_404(conv_oid)
     if conv_doc["room_id"] != room_id:
         raise HTTPException(status_code=404, detail="Conversation not found in this room")
 
@@ -197,7 +200,8 @@ async def get_conversation(
 @router.post("/{conv_id}/turns/{turn_number}", response_model=ConversationResponse)
 async def submit_turn(
     room_id: str,
-    conv_id: str,
+    room_oid: RoomOid,
+    conv_oid: ConversationOid,
     turn_number: int,
     body: SubmitResponseRequest,
     current_user: dict = Depends(get_current_user),
@@ -209,10 +213,9 @@ async def submit_turn(
     - AI turns are auto-skipped when the conversation is fetched.
     """
     user_id = current_user["sub"]
-    room_doc = await _get_room_or_404(room_id)
-    _assert_member(room_doc, user_id)
+    await get_member_room_or_404(room_oid, user_id, {"_id": 1})
 
-    conv_doc = await _get_conversation_or_404(conv_id)
+    conv_doc = await _get_conversation_or_404(conv_oid)
     if conv_doc["room_id"] != room_id:
         raise HTTPException(status_code=404, detail="Conversation not found in this room")
 
@@ -260,13 +263,15 @@ async def submit_turn(
     ).model_dump()
 
     # Determine next turn (skip AI turns automatically)
-    next_turn = _find_next_human_turn(messages, turn_number, participants)
+    ai_roles = frozenset(p["role"] for p in participants if p["is_ai"])
+    next_turn = _find_next_human_turn(messages, turn_number, ai_roles)
     new_status = ConversationStatus.completed if next_turn is None else ConversationStatus.active
     total_turns = len(messages)
     new_current = next_turn if next_turn else total_turns + 1
 
-    await conversations_col().update_one(
-        {"_id": ObjectId(conv_id)},
+    # Update and read back in one round-trip
+    conv_update = conversations_col().find_one_and_update(
+        {"_id": conv_oid},
         {
             "$set": {
                 f"messages.{msg_index}.response": response_doc,
@@ -274,34 +279,35 @@ async def submit_turn(
                 "status": new_status,
             }
         },
+        return_document=ReturnDocument.AFTER,
     )
 
-    # If conversation completed, mark room as completed too
+    # If conversation completed, mark room as completed too (concurrently)
     if new_status == ConversationStatus.completed:
-        await rooms_col().update_one(
-            {"_id": ObjectId(room_id)},
-            {"$set": {"status": RoomStatus.completed}},
+        updated, _ = await asyncio.gather(
+            conv_update,
+            rooms_col().update_one(
+                {"_id": room_oid},
+                {"$set": {"status": RoomStatus.completed}},
+            ),
         )
+    else:
+        updated = await conv_update
 
-    updated = await conversations_col().find_one({"_id": ObjectId(conv_id)})
     return _conv_to_response(updated)
 
 
 def _find_next_human_turn(
     messages: list[dict],
     current_turn_number: int,
-    participants: list[dict],
+    ai_roles: frozenset[str],
 ) -> int | None:
     """
     Starting from the turn after current_turn_number, find the next turn
     that belongs to a real (non-AI) participant. Returns None if no such turn exists.
+    Messages are stored in turn order, so a single forward scan suffices.
     """
-    ai_roles = {p["role"] for p in participants if p["is_ai"]}
-    remaining = sorted(
-        (m for m in messages if m["turn_number"] > current_turn_number),
-        key=lambda m: m["turn_number"],
-    )
-    for m in remaining:
-        if m["speaker"] not in ai_roles:
+    for m in messages:
+        if m["turn_number"] > current_turn_number and m["speaker"] not in ai_roles:
             return m["turn_number"]
     return None
@@ -1,41 +1,51 @@
-import random
+import secrets
 import string
 from fastapi import APIRouter, Depends, HTTPException, status
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 
 from core.auth import get_current_user
 from core.database import conversations_col, rooms_col
+from core.params import RoomOid, get_member_room_or_404
+from core.responses import stream_json_array
 from models.schemas import (
     CreateRoomRequest, JoinRoomRequest, RoomResponse,
-    Room, Member, RoomStatus, utcnow,
+    Room, Member, Level, RoomStatus, utcnow,
 )
 
 router = APIRouter(prefix="/rooms", tags=["Rooms"])
 
 
+_JOIN_CODE_ALPHABET = string.ascii_uppercase + string.digits
+
+
 def _gen_join_code(length: int = 6) -> str:
-    return "".join(random.choices(string.ascii_uppercase + string.digits, k=length))
+    return "".join(secrets.choice(_JOIN_CODE_ALPHABET) for _ in range(length))
 
 
-async def _unique_join_code() -> str:
+async def _insert_with_unique_join_code(doc: dict) -> None:
+    """Insert a room, drawing a fresh join code whenever the unique index rejects one."""
     for _ in range(10):
-        code = _gen_join_code()
-        if not await rooms_col().find_one({"join_code": code}):
-            return code
+        try:
+            await rooms_col().insert_one(doc)
+            return
+        except DuplicateKeyError:
+            doc["join_code"] = _gen_join_code()
     raise RuntimeError("Could not generate a unique join code — try again")
 
 
 def _room_to_response(doc: dict) -> RoomResponse:
-    return RoomResponse(
+    # Stored rooms were validated on insert — skip re-validation, restore enums only
+    return RoomResponse.model_construct(
         id=str(doc["_id"]),
         language=doc["language"],
-        level=doc["level"],
+        level=Level(doc["level"]),
         max_players=doc["max_players"],
         join_code=doc["join_code"],
-        status=doc["status"],
+        status=RoomStatus(doc["status"]),
         created_by=doc["created_by"],
         created_at=doc["created_at"],
-        members=[Member(**m) for m in doc.get("members", [])],
+        members=[Member.model_construct(**m) for m in doc.get("members", [])],
         last_scenario=doc.get("last_scenario"),
         last_scenario_title=doc.get("last_scenario_title"),
         last_conversation_id=doc.get("last_conversation_id"),
@@ -44,7 +54,6 @@ def _room_to_response(doc: dict) -> RoomResponse:
 
 @router.post("", response_model=RoomResponse, status_code=status.HTTP_201_CREATED)
 async def create_room(body: CreateRoomRequest, current_user: dict = Depends(get_current_user)):
-    join_code = await _unique_join_code()
     user_id = current_user["sub"]
     username = current_user["username"]
 
@@ -71,7 +80,7 @@ async def create_room(body: CreateRoomRequest, current_user: dict = Depends(get_
         language=body.language,
         level=body.level,
         max_players=body.max_players,
-        join_code=join_code,
+        join_code=_gen_join_code(),
         status=RoomStatus.waiting,
         created_by=user_id,
         members=[creator_member],
@@ -79,9 +88,9 @@ async def create_room(body: CreateRoomRequest, current_user: dict = Depends(get_
 
     doc = room.model_dump()
     doc["_id"] = ObjectId(room.id)
-    await rooms_col().insert_one(doc)
+    await _insert_with_unique_join_code(doc)
 
-    return _room_to_response(await rooms_col().find_one({"_id": doc["_id"]}))
+    return _room_to_response(doc)
 
 
 @router.post("/join", response_model=RoomResponse)
@@ -130,36 +139,25 @@ async def list_my_rooms(current_user: dict = Depends(get_current_user)):
         {"members.user_id": user_id},
         sort=[("created_at", -1)],
     )
-    return [_room_to_response(doc) async for doc in cursor]
+    return stream_json_array(_room_to_response(doc) async for doc in cursor)
 
 
 @router.get("/{room_id}", response_model=RoomResponse)
-async def get_room(room_id: str, current_user: dict = Depends(get_current_user)):
-    try:
-        oid = ObjectId(room_id)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid room ID")
-
-    doc = await rooms_col().find_one({"_id": oid})
-    if not doc:
-        raise HTTPException(status_code=404, detail="Room not found")
+async def get_room(room_oid: RoomOid, current_user: dict = Depends(get_current_user)):
+    return _room_to_response(await get_member_room_or_404(room_oid, current_user["sub"]))
 
-    user_id = current_user["sub"]
-    if not any(m["user_id"] == user_id for m in doc.get("members", [])):
-        raise HTTPException(status_code=403, detail="You are not a member of this room")
-
-    return _room_to_response(doc)
 
 @router.delete("/{room_id}", status_code=204)
 async def delete_room(
     room_id: str,
+    room_oid: RoomOid,
     current_user: dict = Depends(get_current_user),
 ):
     user_id = current_user["sub"]
-    room_doc = await get_room(room_id, current_user)
-    
-    if room_doc.created_by != user_id:
+    room_doc = await get_member_room_or_404(room_oid, user_id)
+
+    if room_doc["created_by"] != user_id:
         raise HTTPException(status_code=403, detail="Only the host can delete this room")
-    
-    await rooms_col().delete_one({"_id": ObjectId(room_id)})
-    await conversations_col().delete_many({"room_id": room_id})
\ No newline at end of file
+
+    await rooms_col().delete_one({"_id": room_oid})
+    await conversations_col().delete_many({"room_id": room_id})
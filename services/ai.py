@@ -4,32 +4,88 @@ Language and level data is fetched from MongoDB.
 Prompt template is loaded from prompts/conversation.txt.
 """
 
-import json
+import asyncio
+import hashlib
 import re
+import string
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 import google.generativeai as genai
+import orjson
+from cachetools import TTLCache
 from core.config import settings
 from core.database import languages_col, levels_col
 from models.schemas import Participant, Message, Role
 
 genai.configure(api_key=settings.google_api_key)
 
+# JSON mode makes Gemini emit the bare object — no fences or preamble to
+# generate and strip. The model is stateless, so one instance is shared.
+_MODEL = genai.GenerativeModel(
+    "gemini-2.5-flash",
+    generation_config={"response_mime_type": "application/json"},
+)
+
+# Bounds concurrent Gemini calls so bursts queue here instead of hitting quota errors
+_GEMINI_SEMAPHORE = asyncio.Semaphore(settings.gemini_concurrency)
+
+# Parsed Gemini output keyed by a digest of the exact prompt. Opt-in via
+# CONVERSATION_CACHE_TTL: identical prompts (same language, level, scenario,
+# names and turn count) then reuse the conversation instead of a fresh one.
+_conversation_cache: TTLCache = TTLCache(maxsize=256, ttl=settings.conversation_cache_ttl)
+
+# Plain dict lookup for speaker letters — cheaper than Role(...) per turn
+_ROLE_MAP = {r.value: r for r in Role}
+
+# Markdown code fences the model may still wrap its JSON in
+_FENCE_RE = re.compile(r"^```json\s*|^```\s*|```\s*$", re.MULTILINE)
+
 # Load prompt template once at import time
 PROMPT_TEMPLATE = (Path(__file__).parent.parent / "prompts" / "conversation.txt").read_text()
 
+# Tokenize the template once into (literal, field) pairs — `{{`/`}}` escapes are
+# already resolved — so rendering is a single join with no format parsing.
+_PROMPT_PARTS = [
+    (literal, field)
+    for literal, field, _, _ in string.Formatter().parse(PROMPT_TEMPLATE)
+]
+
+
+def _render_prompt(values: dict) -> str:
+    return "".join(
+        literal + (str(values[field]) if field is not None else "")
+        for literal, field in _PROMPT_PARTS
+    )
+
+
+# Language and level documents are small, rarely edited config — keep them in
+# memory briefly so each generation doesn't pay two extra round-trips.
+_reference_cache: TTLCache = TTLCache(maxsize=128, ttl=300)
 
-async def _get_language(code: str) -> dict:
-    lang = await languages_col().find_one({"code": code})
-    if not lang:
-        raise ValueError(f"Language '{code}' not found in database")
+# Only the language fields _build_prompt and _resolve_scenario read
+_LANGUAGE_PROJECTION = {"_id": 0, "code": 1, "display_name": 1, "native_prompt": 1, "roman_prompt": 1}
+
+
+async def _get_language(display_name: str) -> dict:
+    key = ("language", display_name)
+    lang = _reference_cache.get(key)
+    if lang is None:
+        lang = await languages_col().find_one({"display_name": display_name}, _LANGUAGE_PROJECTION)
+        if not lang:
+            raise ValueError(f"Language '{display_name}' not found in database")
+        _reference_cache[key] = lang
     return lang
 
 
 async def _get_level(code: str) -> dict:
-    level = await levels_col().find_one({"code": code})
-    if not level:
-        raise ValueError(f"Level '{code}' not found in database")
+    key = ("level", code)
+    level = _reference_cache.get(key)
+    if level is None:
+        level = await levels_col().find_one({"code": code})
+        if not level:
+            raise ValueError(f"Level '{code}' not found in database")
+        _reference_cache[key] = level
     return level
 
 
@@ -40,6 +96,14 @@ def _resolve_scenario(level_doc: dict, lang_code: str, prompt: Optional[str]) ->
     return level_doc.get("scenarios", {}).get(lang_code) or level_doc["default_scenario"]
 
 
+@lru_cache(maxsize=128)
+def _turn_plan(role_sequence: tuple[str, ...], max_turns: int) -> str:
+    """Distribute turns round-robin across roles. Only a few dozen shapes exist, so it is memoized."""
+    return ", ".join(
+        f"Turn {i+1}→{role_sequence[i % len(role_sequence)]}" for i in range(max_turns)
+    )
+
+
 def _build_prompt(
     lang_doc: dict,
     level_doc: dict,
@@ -55,12 +119,9 @@ def _build_prompt(
         else:
             role_lines.append(f"  Role {p.role.value}: {p.display_name}")
 
-    # Distribute turns round-robin across roles
-    role_sequence = [p.role.value for p in participants]
-    turn_assignments = [role_sequence[i % len(role_sequence)] for i in range(max_turns)]
-    turn_plan = ", ".join(f"Turn {i+1}→{r}" for i, r in enumerate(turn_assignments))
+    turn_plan = _turn_plan(tuple(p.role.value for p in participants), max_turns)
 
-    return PROMPT_TEMPLATE.format(
+    return _render_prompt(dict(
         language=lang_doc["display_name"],
         level=level_doc["code"],
         level_description=level_doc["description"],
@@ -70,7 +131,7 @@ def _build_prompt(
         max_turns=max_turns*len(participants),  # Total turns across all roles
         native_prompt=lang_doc["native_prompt"],
         roman_prompt=lang_doc["roman_prompt"],
-    )
+    ))
 
 
 async def generate_conversation(
@@ -82,24 +143,28 @@ async def generate_conversation(
 ) -> tuple[str, str, list[Message]]:
     """
     Returns (resolved_scenario, scenario_title, list[Message]).
-    Fetches language and level data from MongoDB.
+    Fetches language and level data from MongoDB (cached for a few minutes).
     """
-    # Find language doc by display name
-    lang_doc = await languages_col().find_one({"display_name": language_display})
-    if not lang_doc:
-        raise ValueError(f"Language '{language_display}' not found in database")
-
+    lang_doc = await _get_language(language_display)
     level_doc = await _get_level(level_code)
     scenario = _resolve_scenario(level_doc, lang_doc["code"], prompt)
     ai_prompt = _build_prompt(lang_doc, level_doc, scenario, participants, max_turns)
 
-    model = genai.GenerativeModel("gemini-2.5-flash")
-    response = await model.generate_content_async(ai_prompt)
+    cache_key = hashlib.blake2b(ai_prompt.encode(), digest_size=16).digest()
+    cached = _conversation_cache.get(cache_key)
+    if cached is not None:
+        scenario_title, messages = cached
+        return scenario, scenario_title, list(messages)
+
+    async with _GEMINI_SEMAPHORE:
+        response = await _MODEL.generate_content_async(ai_prompt)
     text = response.text.strip()
 
     # Strip markdown fences if present
-    text = re.sub(r"^```json\s*|^```\s*|```\s*$", "", text, flags=re.MULTILINE).strip()
-    raw = json.loads(text)
+    text = _FENCE_RE.sub("", text).strip()
+    raw = orjson.loads(text)
+    if not isinstance(raw, dict):
+        raise ValueError(f"Expected a JSON object from AI, got {type(raw).__name__}")
 
     # Extract title and turns from new structure
     scenario_title = raw.get("scenario_title", scenario[:20])
@@ -114,7 +179,7 @@ async def generate_conversation(
     messages = [
         Message(
             turn_number=t["turn_number"],
-            speaker=Role(t["speaker"]),
+            speaker=_ROLE_MAP[t["speaker"]],
             roman_text=t["roman_text"],
             native_text=t["native_text"],
             english_text=t["english_text"],
@@ -124,4 +189,7 @@ async def generate_conversation(
         for t in raw_turns
     ]
 
+    if settings.conversation_cache_ttl > 0:
+        _conversation_cache[cache_key] = (scenario_title, tuple(messages))
+
     return scenario, scenario_title, messages
\ No newline at end of file
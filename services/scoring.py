@@ -9,46 +9,32 @@ Returns a score 0-100, a label, and a human-readable breakdown.
 """
 
 import re
+from functools import lru_cache
+from rapidfuzz.distance import Levenshtein
 
+_WS_RE = re.compile(r"\s+")
+_PUNCT_RE = re.compile(r"[^\w\s]", re.UNICODE)
 
+
+# Common lines (greetings, stock phrases) recur across conversations and rooms
+@lru_cache(maxsize=4096)
 def _normalise(text: str) -> str:
     text = text.lower().strip()
-    text = re.sub(r"\s+", " ", text)
+    text = _WS_RE.sub(" ", text)
     # Strip punctuation but keep letters, digits, spaces, and diacritics
-    text = re.sub(r"[^\w\s]", "", text, flags=re.UNICODE)
+    text = _PUNCT_RE.sub("", text)
     return text
 
 
-def _levenshtein(a: str, b: str) -> int:
-    if not a:
-        return len(b)
-    if not b:
-        return len(a)
-    prev = list(range(len(b) + 1))
-    for i, ca in enumerate(a):
-        curr = [i + 1]
-        for j, cb in enumerate(b):
-            cost = 0 if ca == cb else 1
-            curr.append(min(curr[j] + 1, prev[j + 1] + 1, prev[j] + cost))
-        prev = curr
-    return prev[-1]
-
-
 def _word_overlap(input_words: list[str], target_words: list[str]) -> float:
     if not target_words:
         return 1.0
-    input_set = set(input_words)
-    matched = sum(1 for w in target_words if w in input_set)
+    # Every target occurrence counts (repeated target words each score), so a
+    # set intersection would change results — map the membership test in C instead
+    matched = sum(map(frozenset(input_words).__contains__, target_words))
     return matched / len(target_words)
 
 
-def _char_similarity(a: str, b: str) -> float:
-    longer = max(len(a), len(b))
-    if longer == 0:
-        return 1.0
-    return 1.0 - _levenshtein(a, b) / longer
-
-
 def score_response(user_input: str, target: str) -> dict:
     """
     Returns:
@@ -68,7 +54,8 @@ def score_response(user_input: str, target: str) -> dict:
     b_words = b.split()
 
     wo = _word_overlap(a_words, b_words)
-    cs = _char_similarity(a, b)
+    # 1 - distance / max(len) (1.0 for two empty strings), computed in one C call
+    cs = Levenshtein.normalized_similarity(a, b)
 
     raw = wo * 0.55 + cs * 0.45
     score = max(0, min(100, round(raw * 100)))